@@ -2,27 +2,374 @@
 """
 import sys
 import json
+import re
 from pathlib import Path
 import os
-import glob
+import stat
+import atexit
+import weakref
 import shutil
 import logging
+from collections import deque
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from types import ModuleType
 import rdflib
-import networkx as nx
-from networkx.readwrite.graphml import write_graphml, read_graphml
-from typing import Optional, Set, Generator, Union, Tuple, Dict
+from rdflib.plugins.parsers.ntriples import DummySink, W3CNTriplesParser
+from typing import (
+    Any,
+    Optional,
+    Set,
+    Generator,
+    Union,
+    Tuple,
+    Dict,
+    List,
+    Iterable,
+    Iterator,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
 
 FILE_EXTENSIONS = [".ttl", ".rdf", ".owl", ".n3", ".ntriples"]
 
+# directories which never contain ontology definitions of interest; hidden
+# directories (including .ontoenv and .git) are skipped as well
+SKIP_DIRS = {"__pycache__", "node_modules", "venv"}
+
 # TODO: track dependencies in a graph and render it
 
 OntologyLocation = Union[Path, str]
+# the ontology IRIs declared in a file and the IRIs it imports
+OntologyHeader = Tuple[List[str], List[str]]
+
+# maps a start directory to the .ontoenv directory found above it
+_root_cache: Dict[str, Path] = {}
+
+# environments whose pending changes are written out when the process exits
+_live_envs: "weakref.WeakSet[OntoEnv]" = weakref.WeakSet()
+
+
+@lru_cache(maxsize=4096)
+def _guess_format(filename: str) -> Optional[str]:
+    """
+    Memoized wrapper around rdflib.util.guess_format; the same filenames are
+    looked up repeatedly while resolving imports.
+    """
+    return rdflib.util.guess_format(filename)
+
+
+# line-oriented formats where ontology headers can be read without a full parse
+SCANNABLE_EXTENSIONS = (".ttl", ".nt", ".ntriples")
+NTRIPLES_EXTENSIONS = (".nt", ".ntriples")
+
+# an IRI reference or a prefixed name (which may not end in '.')
+_TERM = r"<[^<>\s]*>|(?:[A-Za-z][\w-]*(?:\.[\w-]+)*)?:(?:[\w-]+(?:\.[\w-]+)*)?"
+_PREFIX_DECLARATION = re.compile(
+    r"^[ \t]*(?:@prefix|(?i:PREFIX))\s+((?:[A-Za-z][\w-]*(?:\.[\w-]+)*)?):\s*<([^<>\s]*)>",
+    re.MULTILINE,
+)
+_BASE_DECLARATION = re.compile(r"^[ \t]*(?:@base|(?i:BASE))\s", re.MULTILINE)
+# a triple '<subject> <predicate> <...Ontology>' at the start of a line
+_DECLARATION = re.compile(
+    rf"^[ \t]*({_TERM})\s+(a|{_TERM})\s+"
+    r"(<[^<>\s]*Ontology>|(?:[A-Za-z][\w-]*(?:\.[\w-]+)*)?:Ontology)(?![\w:.#-]|\.[\w-])",
+    re.MULTILINE,
+)
+# any term which may refer to owl:Ontology or owl:imports
+_MENTION = re.compile(
+    r"(?<![\w:<.#-])(?:<[^<>\s]*(?:Ontology|imports)>"
+    r"|(?:[A-Za-z][\w-]*(?:\.[\w-]+)*)?:(?:Ontology|imports))(?![\w:.#-]|\.[\w-])"
+)
+# an object list following a predicate, up to the end of the statement
+_OBJECT_LIST = re.compile(rf"\s+((?:{_TERM})(?:\s*,\s*(?:{_TERM}))*)\s*[;.\]]")
+_OBJECT = re.compile(_TERM)
+# IRIs (kept as they are, since they may contain '#' or quotes), string
+# literals and comments; the latter two are blanked out before scanning
+_IRI_LITERAL_OR_COMMENT = re.compile(
+    r"<[^<>\s]*>"
+    r'|"""(?:[^"\\]|\\.|"(?!""))*"""'
+    r"|'''(?:[^'\\]|\\.|'(?!''))*'''"
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+    r"|#[^\n]*",
+    re.DOTALL,
+)
+
+
+def _blank_literals_and_comments(match: "re.Match[str]") -> str:
+    token = match.group()
+    if token.startswith("<"):
+        return token
+    # an empty literal still occupies the object position of a statement
+    return "" if token.startswith("#") else '""'
+
+
+def _scan_ontology_header(filename: str) -> Optional[OntologyHeader]:
+    """
+    Finds the owl:Ontology declarations and owl:imports of a Turtle or N-Triples
+    file by scanning its text rather than parsing it into a graph. The scan is
+    only trusted if every mention of owl:Ontology and owl:imports in the file is
+    accounted for; otherwise None is returned and the caller should fall back to
+    a full parse.
+
+    :param filename: The file to scan
+    :return: Tuple of the declared ontology IRIs and the imported IRIs, or None
+    """
+    if not filename.lower().endswith(SCANNABLE_EXTENSIONS):
+        return None
+    try:
+        with open(filename, encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    # statements or prefixes inside comments and literals are not part of the graph
+    text = _IRI_LITERAL_OR_COMMENT.sub(_blank_literals_and_comments, text)
+    # relative IRIs would need to be resolved against a base
+    if _BASE_DECLARATION.search(text):
+        return None
+    prefixes: Dict[str, str] = {}
+    for prefix, namespace in _PREFIX_DECLARATION.findall(text):
+        # a re-bound prefix means different things in different parts of the file
+        if prefixes.setdefault(prefix, namespace) != namespace:
+            return None
+
+    def expand(term: str) -> Optional[str]:
+        if term.startswith("<"):
+            iri = term[1:-1]
+            return iri if ":" in iri else None
+        prefix, _, local = term.partition(":")
+        if prefix not in prefixes:
+            return None
+        return prefixes[prefix] + local
+
+    ontology_iri = str(rdflib.OWL.Ontology)
+    imports_iri = str(rdflib.OWL.imports)
+    mentions: Dict[str, List["re.Match[str]"]] = {ontology_iri: [], imports_iri: []}
+    for match in _MENTION.finditer(text):
+        iri = expand(match.group())
+        if iri in mentions:
+            mentions[iri].append(match)
+
+    ontologies: List[str] = []
+    for subject, predicate, obj in _DECLARATION.findall(text):
+        if predicate != "a" and expand(predicate) != str(rdflib.RDF.type):
+            continue
+        if expand(obj) != ontology_iri:
+            continue
+        iri = expand(subject)
+        if iri is None:
+            return None
+        ontologies.append(iri)
+    if len(ontologies) != len(mentions[ontology_iri]):
+        return None
+
+    imports: List[str] = []
+    for match in mentions[imports_iri]:
+        objects = _OBJECT_LIST.match(text, match.end())
+        if objects is None:
+            return None
+        for term in _OBJECT.findall(objects.group(1)):
+            iri = expand(term)
+            if iri is None:
+                return None
+            imports.append(iri)
+    return ontologies, imports
+
+
+class _HeaderSink(DummySink):
+    """
+    rdflib N-Triples parser sink which only keeps the ontology declarations
+    and imports instead of adding every triple to a graph
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.ontologies: Dict[str, None] = {}
+        self.imports: List[str] = []
+
+    def triple(
+        self, s: rdflib.term.Node, p: rdflib.term.Node, o: rdflib.term.Node
+    ) -> None:
+        if p == rdflib.RDF.type and o == rdflib.OWL.Ontology:
+            self.ontologies[str(s)] = None
+        elif p == rdflib.OWL.imports:
+            self.imports.append(str(o))
+
+
+def _parse_ontology_definition(
+    filename: str,
+) -> Tuple[Optional[OntologyHeader], Optional[str]]:
+    """
+    Parses filename with rdflib and returns the ontology IRIs it declares and
+    the IRIs it imports. Runs in worker processes, so errors are returned
+    rather than raised.
+
+    :param filename: The file to parse
+    :return: Tuple of the header (or None on failure) and the error message
+    """
+    logging.info(f"Parsing {filename}")
+    # N-Triples can be streamed without building a graph
+    if filename.lower().endswith(NTRIPLES_EXTENSIONS):
+        sink = _HeaderSink()
+        try:
+            with open(filename, encoding="utf-8") as f:
+                W3CNTriplesParser(sink).parse(f)
+        except Exception as e:
+            return None, str(e)
+        return (list(sink.ontologies), sink.imports), None
+    graph = rdflib.Graph()
+    try:
+        graph.parse(filename, format=_guess_format(filename))
+    except Exception as e:
+        return None, str(e)
+    ontologies = [
+        str(ontology)
+        for ontology in set(graph.subjects(rdflib.RDF.type, rdflib.OWL.Ontology))
+    ]
+    imports = [str(uri) for uri in graph.objects(predicate=rdflib.OWL.imports)]
+    return (ontologies, imports), None
+
+
+def _intern(value: object) -> str:
+    """
+    Returns the interned string form of a URI or filename. URIs are used as
+    keys throughout the environment, so interning lets lookups compare by
+    identity and avoids holding duplicate copies of the same string.
+    """
+    return sys.intern(str(value))
+
+
+def _file_signature(filename: str) -> Optional[Tuple[int, int]]:
+    """
+    Returns the modification time and size of filename, or None if it is not
+    a local file (e.g. a remote URI)
+    """
+    try:
+        st = os.stat(filename)
+    except (OSError, ValueError):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _dumps(obj: object) -> bytes:
+    """
+    Serializes obj to compact JSON, using orjson if it is installed
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True).encode()
+
+
+def _load(path: Path) -> Any:
+    """
+    Reads a JSON file, using orjson if it is installed
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Writes data to a temporary file and then moves it into place, so an
+    interrupted save cannot leave behind a truncated file
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class DependencyGraph:
+    """
+    Directed graph of owl:imports edges between ontology URIs (and the files
+    that were resolved). Stores successor and predecessor adjacency in plain
+    dictionaries, which is all the environment needs and much lighter than a
+    networkx.DiGraph. Successors are kept in insertion order.
+    """
+
+    def __init__(self, edges: Iterable[Tuple[str, str]] = ()) -> None:
+        self._succ: Dict[str, Dict[str, None]] = {}
+        self._pred: Dict[str, Dict[str, None]] = {}
+        self.add_edges_from(edges)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._succ
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._succ)
+
+    def __len__(self) -> int:
+        return len(self._succ)
+
+    def add_edge(self, u: str, v: str) -> None:
+        self._succ.setdefault(u, {})[v] = None
+        self._pred.setdefault(u, {})
+        self._succ.setdefault(v, {})
+        self._pred.setdefault(v, {})[u] = None
+
+    def add_edges_from(self, edges: Iterable[Tuple[str, str]]) -> None:
+        for u, v in edges:
+            self.add_edge(u, v)
+
+    def has_edge(self, u: str, v: str) -> bool:
+        return v in self._succ.get(u, ())
+
+    def remove_node(self, node: str) -> None:
+        for v in self._succ.pop(node, ()):
+            del self._pred[v][node]
+        for u in self._pred.pop(node, ()):
+            del self._succ[u][node]
+
+    def successors(self, node: str) -> Iterator[str]:
+        return iter(self._succ.get(node, ()))
+
+    def in_degree(self, node: str) -> int:
+        return len(self._pred.get(node, ()))
+
+    def nodes(self) -> Iterable[str]:
+        return self._succ.keys()
+
+    def edges(self) -> Generator[Tuple[str, str], None, None]:
+        for u, successors in self._succ.items():
+            for v in successors:
+                yield u, v
+
+    def to_networkx(self) -> "nx.DiGraph":
+        """
+        Returns a copy of the graph as a networkx.DiGraph (e.g. for drawing)
+        """
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._succ)
+        graph.add_edges_from(self.edges())
+        return graph
 
 
 class OntoEnv:
-    _dependencies: nx.DiGraph
+    _dependencies: DependencyGraph
     _graph_cache: Dict[str, rdflib.Graph]
+    _uri_cache: Dict[str, Tuple[rdflib.Graph, OntologyLocation]]
+    _header_cache: Dict[str, Optional[OntologyHeader]]
+    # (st_mtime_ns, st_size) of each file in _graph_cache when it was parsed
+    _graph_signatures: Dict[str, Optional[Tuple[int, int]]]
     _failed_parsing: Set[str]
+    _known_files: Set[str]
 
     def __init__(
         self,
@@ -31,6 +378,9 @@ class OntoEnv:
         strict: bool = False,
     ):
         self._graph_cache = {}
+        self._uri_cache = {}
+        self._header_cache = {}
+        self._graph_signatures = {}
         self._failed_parsing = set()
         """
         *Idempotently* initializes the oe_dir. Creates directories if they don't exist
@@ -79,16 +429,45 @@ class OntoEnv:
                 raise Exception(
                     f"No .ontoenv directory at {self.oedir}. Be sure to run 'ontoenv init'"
                 )
-        self.mapping = json.load(open(mapping_file))
+        self.mapping = {
+            _intern(uri): _intern(filename)
+            for uri, filename in _load(mapping_file).items()
+        }
+        # set whenever the mapping or dependencies change; each file is only
+        # rewritten by _save_if_dirty when its own contents have changed
+        self._mapping_dirty = False
+        self._dependencies_dirty = False
+        # reverse index of self.mapping.values() for constant-time lookups
+        self._known_files = set(self.mapping.values())
+
+        self._dependencies = DependencyGraph()
+        if os.path.exists(self.oedir / "dependencies.json"):
+            self._dependencies.add_edges_from(
+                (_intern(u), _intern(v))
+                for u, v in _load(self.oedir / "dependencies.json")
+            )
+        elif os.path.exists(self.oedir / "dependencies.gml"):
+            # migrate environments created before dependencies.json
+            from networkx.readwrite.graphml import read_graphml
 
-        self._dependencies = nx.DiGraph()
-        if os.path.exists(self.oedir / "dependencies.gml"):
-            self._dependencies = read_graphml(self.oedir / "dependencies.gml")
-            assert isinstance(self._dependencies, nx.DiGraph)
+            self._dependencies.add_edges_from(
+                (_intern(u), _intern(v))
+                for u, v in read_graphml(self.oedir / "dependencies.gml").edges()
+            )
+            self._dependencies_dirty = True
+
+        # nodes which nothing imports; kept up to date as edges change
+        imported = {v for _, v in self._dependencies.edges()}
+        self._roots: Set[str] = set(self._dependencies.nodes()) - imported
 
         self.cache_contents: Set[str] = set()
         self._refresh_cache_contents()
 
+        # persist any changes made outside of refresh() (e.g. resolve_uri) at
+        # exit. The set only holds weak references, so the environment (and its
+        # parsed graphs) can still be garbage collected
+        _live_envs.add(self)
+
         if created:
             self.refresh()
 
@@ -98,36 +477,96 @@ class OntoEnv:
         Does not currently re-fetch remote ontologies.
         """
         logging.info(f"Searching for RDF files in {self.oedir.parent}")
-        for filename in find_ontology_files(self.oedir.parent):
-            self._get_ontology_definition(filename)
-        for filename in find_ontology_files(self.oedir.parent):
-            self._resolve_imports_from_uri(filename)
+        # parsed graphs, visited URIs and parse failures are only valid for a
+        # single refresh; files may have been fixed since the last one
+        self._graph_cache = {}
+        self._uri_cache = {}
+        self._header_cache = {}
+        self._graph_signatures = {}
+        self._seen = set()
+        self._failed_parsing = set()
+        # walk the tree once for both passes; the .ontoenv directory only holds
+        # cached copies of ontologies which are already in the mapping
+        filenames = list(find_ontology_files(self.oedir.parent, exclude=[self.oedir]))
+        pending = [
+            filename
+            for filename in map(_intern, filenames)
+            if filename not in self._known_files
+            and filename not in self._failed_parsing
+        ]
+        for filename, (header, error) in self._read_ontology_definitions(pending):
+            self._add_ontology_definition(filename, header, error)
+        # files which could not be parsed above would only fail again
+        self._resolve_imports_from_uri(
+            *(
+                filename
+                for filename in filenames
+                if filename not in self._failed_parsing
+            )
+        )
 
         # remove old imports/files that are no longer in the mapping
+        # the walk above and the cache listing already tell us which files
+        # exist; only stat the (rare) entries which neither of them covers
+        present = set(filenames)
+        present.update(self.cache_contents)
         mapping_tmp = list(self.mapping.items())
         for uri, filename in mapping_tmp:
-            if not os.path.exists(filename):
+            if filename not in present and not os.path.exists(filename):
                 del self.mapping[uri]
-                self._dependencies.remove_node(uri)
+                self._known_files.discard(filename)
+                if uri in self._dependencies:
+                    successors = list(self._dependencies.successors(uri))
+                    self._dependencies.remove_node(uri)
+                    self._roots.discard(uri)
+                    self._roots.update(
+                        n for n in successors if self._dependencies.in_degree(n) == 0
+                    )
+                self._mapping_dirty = True
+                self._dependencies_dirty = True
                 logging.info(f"Removed {uri} from mapping")
 
+        self._save_if_dirty()
+
     def _refresh_cache_contents(self) -> None:
         self.cache_contents = set()
-        for ext in FILE_EXTENSIONS:
-            pat = str(self.cachedir / f"*{ext}")
-            for fn in glob.glob(pat):
-                self.cache_contents.add(fn)
+        if not os.path.isdir(self.cachedir):
+            return
+        # a single directory scan instead of one glob per extension
+        extensions = tuple(FILE_EXTENSIONS)
+        with os.scandir(self.cachedir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(extensions):
+                    self.cache_contents.add(entry.path)
 
     def _cache_file(self, filename: Path) -> None:
-        if filename.parent == self.cachedir or filename in self.cache_contents:
+        dst = self.cachedir / filename.name
+        if filename.parent == self.cachedir or str(dst) in self.cache_contents:
             return
-        shutil.copy(filename, self.cachedir)
-        self._refresh_cache_contents()
+        # hardlinking avoids copying the file contents; fall back to a copy
+        # across filesystems or where links are not supported
+        try:
+            os.link(filename, dst)
+        except OSError:
+            shutil.copy(filename, dst)
+        self.cache_contents.add(str(dst))
+
+    def _save_if_dirty(self) -> None:
+        if self._mapping_dirty:
+            self._save_mapping()
+        if self._dependencies_dirty:
+            self._save_dependencies()
+
+    def _save_mapping(self) -> None:
+        _write_atomic(self.oedir / "mapping.json", _dumps(self.mapping))
+        self._mapping_dirty = False
 
-    def _save(self) -> None:
-        with open(self.oedir / "mapping.json", "w") as f:
-            json.dump(self.mapping, f)
-        write_graphml(self._dependencies, self.oedir / "dependencies.gml")
+    def _save_dependencies(self) -> None:
+        _write_atomic(
+            self.oedir / "dependencies.json",
+            _dumps(list(self._dependencies.edges())),
+        )
+        self._dependencies_dirty = False
 
     def resolve_uri(
         self, uri: OntologyLocation
@@ -141,27 +580,39 @@ class OntoEnv:
         :return: Tuple of the RDF Graph and the physical filename where it was found
         :raises Exception: [TODO:description]
         """
-        uri = str(uri)
+        uri = _intern(uri)
+        # memoize so repeated imports of the same URI are only fetched once, as
+        # long as the file it resolved to has not changed since
+        cached = self._uri_cache.get(uri)
+        if cached is None or self._cached_graph(_intern(cached[1])) is not cached[0]:
+            cached = self._uri_cache[uri] = self._resolve_uri(uri)
+        return cached
 
+    def _resolve_uri(self, uri: str) -> Tuple[rdflib.Graph, OntologyLocation]:
         # attempt to resolve locally
         if uri in self.mapping:
             filename = self.mapping[uri]
             # check if the graph is in the cache
-            if uri in self._graph_cache:
-                return self._graph_cache[uri], filename
+            graph = self._cached_graph(filename)
+            if graph is not None:
+                return graph, filename
             # if not in the cache, parse the graph
             graph = rdflib.Graph()
-            graph.parse(filename, format=rdflib.util.guess_format(filename) or "xml")
+            graph.parse(filename, format=_guess_format(filename) or "xml")
             # store the parsed graph in the cache
-            self._graph_cache[uri] = graph
+            self._cache_graph(filename, graph)
             return graph, filename
+        # local files which do not define an ontology may have been parsed already
+        graph = self._cached_graph(uri)
+        if graph is not None:
+            return graph, uri
         # create graph object to hold the remote graph
         graph = rdflib.Graph()
         logging.info(
             f"URI {uri} was not defined locally or did not have a cached definition. Trying to fetch remote"
         )
         try:
-            graph.parse(uri, format=rdflib.util.guess_format(uri) or "xml")
+            graph.parse(uri, format=_guess_format(uri) or "xml")
             filename = uri
         except Exception as e:
             raise Exception(f"No definition for {uri}: {e}")
@@ -169,71 +620,179 @@ class OntoEnv:
         # if the filename does not exist locally, then serialize the graph into the cache
         # and upate the mapping
         if not os.path.exists(filename):
-            filename = str(filename) + ".ttl"
-            filename = self.cachedir / Path(
-                filename.replace("/", "_").replace(":", "_")
+            cache_path = self.cachedir / (filename + ".ttl").replace("/", "_").replace(
+                ":", "_"
             )
-            graph.serialize(str(filename), format="ttl")
-            self.mapping[str(uri)] = str(filename)
-            self._refresh_cache_contents()
+            graph.serialize(str(cache_path), format="ttl")
+            filename = _intern(cache_path)
+            self.mapping[uri] = filename
+            self._known_files.add(filename)
+            self._mapping_dirty = True
+            self.cache_contents.add(filename)
+        self._cache_graph(_intern(filename), graph)
         return graph, filename
 
+    def _cache_graph(self, filename: str, graph: rdflib.Graph) -> None:
+        self._graph_cache[filename] = graph
+        self._graph_signatures[filename] = _file_signature(filename)
+
+    def _cached_graph(self, filename: str) -> Optional[rdflib.Graph]:
+        """
+        Returns the parsed graph of filename if it is cached and the file has
+        not been modified since it was parsed; stale entries are dropped.
+        """
+        graph = self._graph_cache.get(filename)
+        if graph is None:
+            return None
+        if self._graph_signatures.get(filename) != _file_signature(filename):
+            del self._graph_cache[filename]
+            self._graph_signatures.pop(filename, None)
+            self._header_cache.pop(filename, None)
+            return None
+        return graph
+
     def _get_ontology_definition(self, filename: OntologyLocation) -> None:
         """
         If the filename is not already in the mapping, it parses the file and updates the mapping.
 
         :param filename: The filename of the ontology
         """
+        filename = _intern(filename)
+        if filename in self._known_files or filename in self._failed_parsing:
+            return
+        for filename, (header, error) in self._read_ontology_definitions([filename]):
+            self._add_ontology_definition(filename, header, error)
+
+    def _read_ontology_definitions(
+        self, filenames: List[str]
+    ) -> Generator[Tuple[str, Tuple[Optional[OntologyHeader], Optional[str]]], None, None]:
+        """
+        Reads the ontology declarations and imports of each file. Files whose
+        headers cannot be scanned are parsed with rdflib; since parsing is
+        CPU-bound, several such files are parsed in a pool of worker processes.
+
+        :param filenames: The files to read
+        :return: A generator of (filename, (header, error message)) pairs
+        """
+        to_parse = []
+        for filename in filenames:
+            # avoid building a graph when the declarations can be found by scanning
+            header = self._scan_header(filename)
+            if header is not None and header[0]:
+                yield filename, (header, None)
+            else:
+                to_parse.append(filename)
+        # strict mode stays serial so that it stops at the first failure; worker
+        # processes are forked so that they do not re-import the __main__ module,
+        # which is only safe to do on Linux (macOS defaults to spawn for a reason)
+        # and only while this is the sole thread: a child forked from a
+        # multi-threaded host (e.g. a web app embedding OntoEnv) can deadlock on
+        # locks, such as those of logging handlers, held by another thread
         if (
-            str(filename) in self.mapping.values()
-            or str(filename) in self._failed_parsing
+            len(to_parse) > 1
+            and not self._strict
+            and sys.platform.startswith("linux")
+            and threading.active_count() == 1
         ):
-            return
-        graph = rdflib.Graph()
-        logging.info(f"Parsing {filename}")
-        try:
-            graph.parse(filename, format=rdflib.util.guess_format(str(filename)))
-        except Exception as e:
-            self._failed_parsing.add(str(filename))
+            done = 0
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(len(to_parse), os.cpu_count() or 1),
+                    mp_context=multiprocessing.get_context("fork"),
+                ) as executor:
+                    for result in executor.map(
+                        _parse_ontology_definition, to_parse, chunksize=8
+                    ):
+                        yield to_parse[done], result
+                        done += 1
+            except BrokenProcessPool:
+                logging.warning(
+                    "A parser process died; parsing the remaining files in this process"
+                )
+            to_parse = to_parse[done:]
+        yield from zip(to_parse, map(_parse_ontology_definition, to_parse))
+
+    def _add_ontology_definition(
+        self, filename: str, header: Optional[OntologyHeader], error: Optional[str]
+    ) -> None:
+        if header is None:
+            self._failed_parsing.add(filename)
             if self._strict:
-                logging.fatal(f"Could not parse {filename}: {e}")
+                logging.fatal(f"Could not parse {filename}: {error}")
                 sys.exit(1)
             else:
-                logging.error(f"Could not parse {filename}: {e}")
+                logging.error(f"Could not parse {filename}: {error}")
                 return
-        # find ontology definitions and update mapping
-        q = """SELECT ?ont ?prop ?value WHERE {
-            ?ont a <http://www.w3.org/2002/07/owl#Ontology> .
-            ?ont ?prop ?value
-        }"""
-        for row in graph.query(q):
-            assert isinstance(row, tuple)
-            self.mapping[str(row[0])] = str(filename)
-        self._save()
-
-    def _resolve_imports_from_uri(self, uri: OntologyLocation) -> None:
+        # keep the header so the import-resolution pass need not parse the file
+        self._header_cache[filename] = header
+        for ontology in header[0]:
+            self.mapping[_intern(ontology)] = filename
+            self._known_files.add(filename)
+            self._mapping_dirty = True
+
+    def _scan_header(self, filename: str) -> Optional[OntologyHeader]:
         """
-        Resolves the imports from the given URI.
+        Memoized _scan_ontology_header; the parse pass and the import-resolution
+        pass of refresh() both need the header of each file.
+        """
+        if filename not in self._header_cache:
+            self._header_cache[filename] = _scan_ontology_header(filename)
+        return self._header_cache[filename]
 
-        :param uri: The URI to resolve imports from
+    def _scanned_imports(self, uri: str) -> Optional[List[str]]:
         """
-        logging.info(f"Resolving imports from {uri}")
-        if str(uri) in self._seen:
-            return
-        self._seen.add(str(uri))
-        try:
-            graph, filename = self.resolve_uri(uri)
-            self._get_ontology_definition(filename)
-            for importURI in graph.objects(predicate=rdflib.OWL.imports):
-                self._dependencies.add_edge(str(uri), str(importURI))
-                self._resolve_imports_from_uri(str(importURI))
-        except Exception as e:
-            if self._strict:
-                logging.fatal(f"Could not resolve {uri} ({e})")
-                sys.exit(1)
-            else:
-                logging.error(f"Could not resolve {uri} ({e})")
-                return
+        Returns the owl:imports of a local ontology (given by URI or filename)
+        if they can be found without parsing it, otherwise None.
+        """
+        filename = self.mapping.get(uri, uri)
+        # graphs which were parsed anyway are cheaper to read than to scan
+        if filename in self._graph_cache or not os.path.isfile(filename):
+            return None
+        header = self._scan_header(filename)
+        return header[1] if header is not None else None
+
+    def _resolve_imports_from_uri(self, *uris: OntologyLocation) -> None:
+        """
+        Resolves the imports from the given URIs, following owl:imports transitively.
+
+        :param uris: The URIs to resolve imports from
+        """
+        work = deque(_intern(uri) for uri in uris)
+        while work:
+            uri = work.popleft()
+            if uri in self._seen:
+                continue
+            self._seen.add(uri)
+            logging.info(f"Resolving imports from {uri}")
+            try:
+                local_imports = self._scanned_imports(uri)
+                if local_imports is not None:
+                    import_uris: Iterable = local_imports
+                else:
+                    graph, filename = self.resolve_uri(uri)
+                    self._get_ontology_definition(filename)
+                    import_uris = graph.objects(predicate=rdflib.OWL.imports)
+                # dict.fromkeys de-duplicates while keeping the import order
+                imports = dict.fromkeys(map(_intern, import_uris))
+                # only record edges which are not already in the graph
+                new_edges = [
+                    (uri, import_uri)
+                    for import_uri in imports
+                    if not self._dependencies.has_edge(uri, import_uri)
+                ]
+                if new_edges:
+                    if self._dependencies.in_degree(uri) == 0:
+                        self._roots.add(uri)
+                    self._dependencies.add_edges_from(new_edges)
+                    self._roots.difference_update(v for _, v in new_edges)
+                    self._dependencies_dirty = True
+                work.extend(i for i in imports if i not in self._seen)
+            except Exception as e:
+                if self._strict:
+                    logging.fatal(f"Could not resolve {uri} ({e})")
+                    sys.exit(1)
+                else:
+                    logging.error(f"Could not resolve {uri} ({e})")
 
     def print_dependency_graph(self, root_uri: Optional[str] = None) -> None:
         """
@@ -245,19 +804,26 @@ class OntoEnv:
             "\033[1mBolded\033[0m values are duplicate imports whose deps are listed elsewhere in the tree"
         )
         if root_uri is None or root_uri == "":
-            root_uris = [n for n, d in self._dependencies.in_degree() if d == 0]
+            root_uris = sorted(self._roots)
         elif root_uri not in self._dependencies:
             root_uris = [self.mapping[root_uri]]
         else:
             root_uris = [root_uri]
+        # index successors once rather than filtering the edge view per node
+        adj = {n: list(self._dependencies.successors(n)) for n in self._dependencies}
         seen: Set[str] = set()
         for root in root_uris:
             print(f"{root}")
-            for _, dep in self._dependencies.edges([root]):
-                self._print_dep_graph(dep, 1, seen)
+            for dep in adj.get(root, []):
+                self._print_dep_graph(dep, 1, seen, adj)
 
     def _print_dep_graph(
-        self, uri: str, indent: int, seen: Set[str], last: bool = False
+        self,
+        uri: str,
+        indent: int,
+        seen: Set[str],
+        adj: Dict[str, List[str]],
+        last: bool = False,
     ) -> None:
         char = "┕" if last else "┝"
         if uri in seen:
@@ -265,13 +831,14 @@ class OntoEnv:
             return
         print(f"{'|  '*indent}{char} {uri}")
         seen.add(uri)
-        num_deps = len(self._dependencies.edges([uri]))
-        for i, (_, dep) in enumerate(self._dependencies.edges([uri])):
-            self._print_dep_graph(dep, indent + 1, seen, last=i == num_deps - 1)
+        children = adj.get(uri, [])
+        num_deps = len(children)
+        for i, dep in enumerate(children):
+            self._print_dep_graph(dep, indent + 1, seen, adj, last=i == num_deps - 1)
 
     def import_dependencies(
         self, graph: rdflib.Graph, recursive: bool = True, recursive_limit: int = -1, remove_import_statements: bool = True
-    ) -> None:
+    ) -> bool:
         """
         Imports all dependencies of the given graph. Rewrites sh:prefixes and sh:declare statements to
         hang off of the ontology declaration of the provided graph
@@ -280,28 +847,76 @@ class OntoEnv:
         :param recursive: Whether to recursively import dependencies
         :param recursive_limit: The maximum depth to recursively import dependencies. -1 means no limit.
         :param remove_import_statements: Whether to remove the import statements from the graph after importing them
+        :return: Whether the graph was modified
         """
         # get the base URI of this graph (subject of owl:Ontology)
         uri = graph.value(predicate=rdflib.RDF.type, object=rdflib.OWL.Ontology)
         if uri is None:
             raise Exception("No owl:Ontology found in graph")
         # import all dependencies
-        self._import_dependencies(
+        modified = self._import_dependencies(
             graph, recursive=recursive, recursive_limit=recursive_limit
         )
         # change all triples of form <x> <sh:prefixes> <uri1> to <x> <sh:prefixes> <uri>, where
         # <uri> is our base URI above
-        for s, p, o in graph.triples((None, rdflib.SH.prefixes, None)):
-            graph.remove((s, p, o))
-            graph.add((s, p, uri))
+        for s, p, o in list(graph.triples((None, rdflib.SH.prefixes, None))):
+            if o != uri:
+                graph.remove((s, p, o))
+                graph.add((s, p, uri))
+                modified = True
         # change all triples of form <x> <sh:declare> <uri1> to <uri> <sh:declare> <uri1>, where
         # <uri> is our base URI above
-        for s, p, o in graph.triples((None, rdflib.SH.declare, None)):
-            graph.remove((s, p, o))
-            graph.add((uri, p, o))
+        for s, p, o in list(graph.triples((None, rdflib.SH.declare, None))):
+            if s != uri:
+                graph.remove((s, p, o))
+                graph.add((uri, p, o))
+                modified = True
         # remove all import statements
-        if remove_import_statements:
+        if remove_import_statements and (None, rdflib.OWL.imports, None) in graph:
             graph.remove((None, rdflib.OWL.imports, None))
+            modified = True
+        return modified
+
+    def read_imports(self, filename: OntologyLocation) -> List[str]:
+        """
+        Returns the IRIs imported by the given file without loading it into a graph
+        where possible: Turtle and N-Triples headers are scanned, and N-Triples files
+        are otherwise streamed. Other files, and files the scan cannot vouch for,
+        are parsed.
+
+        :param filename: The file to read the owl:imports of
+        :return: The imported IRIs
+        :raises Exception: if the file cannot be parsed
+        """
+        filename = _intern(filename)
+        header = _scan_ontology_header(filename)
+        if header is None:
+            header, error = _parse_ontology_definition(filename)
+            if header is None:
+                raise Exception(f"Could not parse {filename}: {error}")
+        return header[1]
+
+    def import_dependencies_from_iris(
+        self, iris: Iterable[str], recursive: bool = True, recursive_limit: int = -1
+    ) -> rdflib.Graph:
+        """
+        Returns a new graph containing the ontologies imported by the given IRIs. Unlike
+        import_dependencies, this does not need the importing graph in memory, e.g. when
+        the imports have been read from the header of a large file.
+
+        :param iris: The IRIs of the ontologies to import
+        :param recursive: Whether to recursively import dependencies
+        :param recursive_limit: The maximum depth to recursively import dependencies. -1 means no limit.
+        :return: The graph of imported ontologies
+        """
+        graph = rdflib.Graph()
+        self._import_dependencies(
+            graph,
+            recursive=recursive,
+            recursive_limit=recursive_limit,
+            import_uris=iris,
+        )
+        return graph
 
     def _import_dependencies(
         self,
@@ -309,19 +924,31 @@ class OntoEnv:
         cache: Optional[set] = None,
         recursive: bool = True,
         recursive_limit: int = -1,
-    ) -> None:
+        import_uris: Optional[Iterable[str]] = None,
+    ) -> bool:
+        # maximum import depth to follow; -1 means no limit
         if recursive_limit > 0:
-            recursive = False
+            max_depth = recursive_limit
         elif recursive_limit == 0:
-            return
+            return False
+        else:
+            max_depth = -1 if recursive else 1
         if cache is None:
             cache = set()
-        new_imports = False
-        for importURI in graph.objects(predicate=rdflib.OWL.imports):
-            uri = str(importURI)
+        # breadth-first over import URIs, tracking the depth of each; only the
+        # owl:imports introduced by each parsed file are queued
+        start: Iterable[object] = (
+            import_uris
+            if import_uris is not None
+            else graph.objects(predicate=rdflib.OWL.imports)
+        )
+        imports = dict.fromkeys(map(_intern, start))
+        work = deque((uri, 1) for uri in imports if uri not in cache)
+        modified = False
+        while work:
+            uri, depth = work.popleft()
             if uri in cache:
                 continue
-            new_imports = True
             filename = self.mapping.get(uri)
             if filename is None:
                 if self._strict:
@@ -330,15 +957,49 @@ class OntoEnv:
                 cache.add(uri)
                 continue
             logging.info(f"Importing {uri} from {filename}")
-            graph.parse(filename, format=rdflib.util.guess_format(filename))
+            # copying an already-parsed graph is much cheaper than parsing it again
+            imported = self._cached_graph(filename)
+            if imported is None:
+                imported = rdflib.Graph()
+                imported.parse(filename, format=_guess_format(filename))
+                self._cache_graph(filename, imported)
+                # the header may have been scanned before the file last changed
+                self._header_cache.pop(filename, None)
+            graph += imported
+            # += only copies triples; keep the imported file's prefixes as parsing
+            # it into the graph directly would have
+            for prefix, namespace in imported.namespaces():
+                graph.bind(prefix, namespace, override=False)
+            modified = True
             cache.add(uri)
-        if (recursive or recursive_limit > 0) and new_imports:
-            self._import_dependencies(
-                graph,
-                cache=cache,
-                recursive=recursive,
-                recursive_limit=recursive_limit - 1,
-            )
+            # take the file's own imports from its header where possible rather
+            # than enumerating every owl:imports triple in the merged graph
+            header = self._scan_header(filename)
+            if header is not None:
+                file_imports: Iterable = header[1]
+            else:
+                file_imports = imported.objects(predicate=rdflib.OWL.imports)
+            new_imports = [
+                import_uri
+                for import_uri in map(_intern, file_imports)
+                if import_uri not in imports
+            ]
+            imports.update(dict.fromkeys(new_imports))
+            if max_depth < 0 or depth < max_depth:
+                work.extend(
+                    (import_uri, depth + 1)
+                    for import_uri in new_imports
+                    if import_uri not in cache
+                )
+        return modified
+
+
+def _save_at_exit() -> None:
+    for oe in list(_live_envs):
+        oe._save_if_dirty()
+
+
+atexit.register(_save_at_exit)
 
 
 def find_root_file(start: Optional[OntologyLocation] = None) -> Optional[Path]:
@@ -351,39 +1012,63 @@ def find_root_file(start: Optional[OntologyLocation] = None) -> Optional[Path]:
     if start is None:
         start = Path(os.getcwd())
     start = Path(start)
+    key = str(start)
+    cached = _root_cache.get(key)
+    if cached is not None:
+        # the environment may have been deleted since it was found
+        if os.path.isdir(cached):
+            return cached
+        del _root_cache[key]
 
-    oe_dir = start / ".ontoenv"
-
-    # if '.ontoenv' exists and is a directory
-    if os.path.exists(oe_dir):
-        if not oe_dir.is_dir():
-            raise Exception(f".ontoenv ({oe_dir}) must be a directory")
-        return oe_dir
-
-    if len(start.parts) == 1:
-        return None
-
-    return find_root_file(start.parent)
+    directory = start
+    while True:
+        oe_dir = directory / ".ontoenv"
+        # a single stat tells us both whether '.ontoenv' exists and if it is a directory
+        try:
+            mode = os.stat(oe_dir).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            mode = None
+        if mode is not None:
+            if not stat.S_ISDIR(mode):
+                raise Exception(f".ontoenv ({oe_dir}) must be a directory")
+            # only successful lookups are cached: a missing .ontoenv may
+            # still be created later by 'ontoenv init'
+            _root_cache[key] = oe_dir
+            return oe_dir
+        if directory.parent == directory:
+            return None
+        directory = directory.parent
 
 
-def find_ontology_files(start: Path) -> Generator[OntologyLocation, None, None]:
+def find_ontology_files(
+    start: OntologyLocation, exclude: Iterable[OntologyLocation] = ()
+) -> Generator[OntologyLocation, None, None]:
     """
     Starting at the given directory, explore all subtrees and gather all ontology
     files, as identified by their file extension (see FILE_EXTENSIONS).
-    Returns a generator which yields all files matching one of the FILE_EXTENSIONS
+    Returns a generator which yields all files matching one of the FILE_EXTENSIONS.
+    Hidden directories and those named in SKIP_DIRS are not explored.
 
     :param start: The directory to start from.
+    :param exclude: Directories which should not be explored.
     :return: A generator yielding all ontology files.
     """
-    # use parent of the .ontoenv directory
-    for filename in start.iterdir():
-        full_suffix = ".".join(filename.suffixes)
-        matches_extension = (
-            filename.suffix in FILE_EXTENSIONS or full_suffix in FILE_EXTENSIONS
-        )
-        if matches_extension and not filename.is_dir():
-            yield filename
-        if not filename.is_dir():
-            continue
-        for newfn in find_ontology_files(filename):
-            yield newfn
+    extensions = tuple(FILE_EXTENSIONS)
+    excluded = {os.fspath(directory) for directory in exclude}
+    # walk the tree with an explicit stack; DirEntry caches the file type so
+    # this avoids the extra stat calls of Path.iterdir/is_dir
+    stack = [os.fspath(start)]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if (
+                        entry.name.startswith(".")
+                        or entry.name in SKIP_DIRS
+                        or entry.path in excluded
+                    ):
+                        continue
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(extensions):
+                    yield entry.path
@@ -1,66 +1,125 @@
+import os
 import sys
-import rdflib
+import shutil
 import click
 import logging
-from ontoenv import OntoEnv
-import networkx as nx
+from ontoenv import OntoEnv, _guess_format
 
 
-@click.group(help="Manage ontology definition mappings")
-@click.option("-v", is_flag=True)
-def i(v):
-    if v:
+def _set_verbose(ctx: click.Context, param: click.Parameter, value: bool) -> None:
+    if value:
         logging.basicConfig(level=logging.INFO)
 
 
+def _verbose_option(f):
+    return click.option(
+        "-v",
+        help="Verbose output",
+        is_flag=True,
+        expose_value=False,
+        callback=_set_verbose,
+    )(f)
+
+
+def _common_options(f):
+    """
+    Adds the -v (verbose) and -s (strict) options shared by the commands
+    """
+    f = click.option("-s", help="Strict mode (error on missing ontologies)", is_flag=True)(f)
+    return _verbose_option(f)
+
+
+@click.group(help="Manage ontology definition mappings")
+@_verbose_option
+@click.pass_context
+def i(ctx):
+    ctx.ensure_object(dict)
+
+
+def _get_env(ctx: click.Context, strict: bool = False) -> OntoEnv:
+    """
+    Returns the environment in the current directory, loading it at most once
+    per strictness for all commands run in this process
+    """
+    envs = ctx.ensure_object(dict)
+    if strict not in envs:
+        envs[strict] = OntoEnv(initialize=False, strict=strict)
+    return envs[strict]
+
+
 @i.command(help="Initializes .ontoenv in the current directory")
-@click.option("-v", help="Verbose output", is_flag=True)
-@click.option("-s", help="Strict mode (error on missing ontologies)", is_flag=True)
-def init(v, s):
-    if v:
-        logging.basicConfig(level=logging.INFO)
-    OntoEnv(initialize=True, strict=s)
+@_common_options
+@click.pass_context
+def init(ctx, s):
+    ctx.ensure_object(dict)[s] = OntoEnv(initialize=True, strict=s)
 
 
 @i.command(help="Rebuilds the .ontoenv cache and mapping in the current directory")
-@click.option("-v", help="Verbose output", is_flag=True)
-@click.option("-s", help="Strict mode (error on missing ontologies)", is_flag=True)
-def refresh(v, s):
-    if v:
-        logging.basicConfig(level=logging.INFO)
-    oe = OntoEnv(initialize=False, strict=s)
+@_common_options
+@click.pass_context
+def refresh(ctx, s):
+    oe = _get_env(ctx, s)
     oe.refresh()
 
 
 @i.command(help="Print mapping of ontology URI => filename!")
-@click.option("-v", help="Verbose output", is_flag=True)
-@click.option("-s", help="Strict mode (error on missing ontologies)", is_flag=True)
-def dump(v, s):
-    if v:
-        logging.basicConfig(level=logging.INFO)
-    oe = OntoEnv(initialize=False, strict=s)
-    for ontology, filename in oe.mapping.items():
-        print(f"{ontology} => {filename}")
+@_common_options
+@click.pass_context
+def dump(ctx, s):
+    oe = _get_env(ctx, s)
+    # one write instead of a print (and line-buffered flush) per entry; keys
+    # and values are already strings, so joining the pairs avoids formatting
+    if oe.mapping:
+        sys.stdout.write("\n".join(map(" => ".join, oe.mapping.items())) + "\n")
 
 
 @i.command(help="Output dependency graph")
 @click.argument("output_filename", default="dependencies.pdf")
-def output(output_filename):
+@click.option(
+    "--layout",
+    type=click.Choice(["spring", "energy", "sfdp"]),
+    default="spring",
+    help="Graph layout; 'energy' (networkx>=3.4) and 'sfdp' (Graphviz) scale to large graphs",
+)
+@click.pass_context
+def output(ctx, output_filename, layout):
     try:
+        import matplotlib
+
+        # only ever writes to a file; skip probing for interactive backends
+        matplotlib.use("Agg")
         import matplotlib.pyplot as plt
     except ImportError:
         logging.error("Could not import matplotlib; please install it by running 'pip install ontoenv[viz]' and try again")
         sys.exit(1)
-    oe = OntoEnv(initialize=False)
-    pos = nx.spring_layout(oe._dependencies, 2)
-    nx.draw_networkx(oe._dependencies, pos=pos, with_labels=True)
-    plt.savefig(output_filename)
+    import networkx as nx
+
+    oe = _get_env(ctx)
+    dependencies = oe._dependencies.to_networkx()
+    if layout == "sfdp":
+        pos = nx.nx_pydot.graphviz_layout(dependencies, prog="sfdp")
+    elif layout == "energy":
+        try:
+            pos = nx.spring_layout(dependencies, method="energy", seed=0, weight=None)
+        except TypeError:
+            # the method parameter was added in networkx 3.4
+            logging.error("The energy layout requires networkx>=3.4; please upgrade networkx or use another --layout")
+            sys.exit(1)
+    else:
+        # import edges carry no weights; networkx itself switches to a sparse
+        # adjacency matrix from 500 nodes on
+        pos = nx.spring_layout(dependencies, k=2, seed=0, weight=None)
+    fig, ax = plt.subplots()
+    nx.draw_networkx(dependencies, pos=pos, with_labels=True, ax=ax)
+    fig.savefig(output_filename)
+    plt.close(fig)
 
 
 @i.command(help="Print dependency graph")
 @click.argument("root_uri", default="")
-def deps(root_uri):
-    oe = OntoEnv(initialize=False)
+@click.pass_context
+def deps(ctx, root_uri):
+    oe = _get_env(ctx)
     oe.print_dependency_graph(root_uri)
 
 
@@ -70,14 +129,45 @@ def deps(root_uri):
 )
 @click.argument("input_filename")
 @click.argument("output_filename")
-@click.argument("recursive", default=False)
-@click.argument("recursive_limit", default=-1)
-def import_deps(input_filename, output_filename, recursive, recursive_limit):
+@click.argument("recursive", type=click.BOOL, default=False)
+@click.argument("recursive_limit", type=int, default=-1)
+@click.option(
+    "--imports-only",
+    is_flag=True,
+    help="Only output the imported ontologies; reads just the owl:imports of the input instead of loading the whole graph",
+)
+@click.option(
+    "--format",
+    "output_format",
+    help="RDF format of the output (default: guessed from the output filename, else turtle); 'nt' is the fastest to write",
+)
+@click.pass_context
+def import_deps(ctx, input_filename, output_filename, recursive, recursive_limit, imports_only, output_format):
+    if output_format is None:
+        output_format = _guess_format(output_filename) or "turtle"
+    if imports_only:
+        oe = _get_env(ctx)
+        try:
+            iris = oe.read_imports(input_filename)
+        except Exception as e:
+            logging.error(e)
+            sys.exit(1)
+        g = oe.import_dependencies_from_iris(iris, recursive, recursive_limit)
+        g.serialize(output_filename, format=output_format)
+        return
+    import rdflib
+
+    fmt = _guess_format(input_filename)
     g = rdflib.Graph()
-    g.parse(input_filename, format=rdflib.util.guess_format(input_filename))
-    oe = OntoEnv(initialize=False)
-    oe.import_dependencies(g, recursive, recursive_limit)
-    g.serialize(output_filename, format="turtle")
+    g.parse(input_filename, format=fmt)
+    oe = _get_env(ctx)
+    if oe.import_dependencies(g, recursive, recursive_limit) or fmt != output_format:
+        g.serialize(output_filename, format=output_format)
+    # nothing was imported or rewritten, so the input is already the output
+    elif not os.path.exists(output_filename) or not os.path.samefile(
+        input_filename, output_filename
+    ):
+        shutil.copyfile(input_filename, output_filename)
 
 
 if __name__ == "__main__":
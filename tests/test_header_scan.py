@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ontoenv import _parse_ontology_definition, _scan_ontology_header
+
+PREFIXES = """@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+"""
+
+
+class ScanOntologyHeaderTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+
+    def _scan(self, body):
+        filename = str(Path(self._tmpdir.name) / "model.ttl")
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(PREFIXES + body)
+        return _scan_ontology_header(filename), _parse_ontology_definition(filename)[0]
+
+    def test_imports(self):
+        scanned, parsed = self._scan(
+            "<http://ex.org/a> a owl:Ontology ;\n"
+            "    owl:imports <http://ex.org/b>, <http://ex.org/c> .\n"
+        )
+        self.assertEqual(scanned, (["http://ex.org/a"], ["http://ex.org/b", "http://ex.org/c"]))
+        self.assertEqual(scanned, parsed)
+
+    def test_commented_import_is_ignored(self):
+        scanned, parsed = self._scan(
+            "<http://ex.org/a> a owl:Ontology ;\n"
+            "    # owl:imports <http://ex.org/commented> ;\n"
+            "    rdfs:label \"a\" .\n"
+        )
+        self.assertEqual(scanned, (["http://ex.org/a"], []))
+        self.assertEqual(scanned, parsed)
+
+    def test_import_in_literal_is_ignored(self):
+        scanned, parsed = self._scan(
+            "<http://ex.org/a> a owl:Ontology ;\n"
+            '    rdfs:comment """previously:\n'
+            '    owl:imports <http://ex.org/old> .""" ;\n'
+            "    rdfs:label 'owl:imports <http://ex.org/older>' .\n"
+        )
+        self.assertEqual(scanned, (["http://ex.org/a"], []))
+        self.assertEqual(scanned, parsed)
+
+    def test_commented_declaration_is_ignored(self):
+        scanned, parsed = self._scan(
+            "# <http://ex.org/old> a owl:Ontology .\n"
+            "<http://ex.org/a> a owl:Ontology .\n"
+        )
+        self.assertEqual(scanned, (["http://ex.org/a"], []))
+        self.assertEqual(scanned, parsed)
+
+    def test_rebound_prefix_is_not_trusted(self):
+        scanned, parsed = self._scan(
+            "@prefix ex: <http://ex.org/> .\n"
+            "ex:a a owl:Ontology ; owl:imports ex:b .\n"
+            "@prefix ex: <http://two/> .\n"
+            "ex:c rdfs:label \"c\" .\n"
+        )
+        self.assertIsNone(scanned)
+        self.assertEqual(parsed, (["http://ex.org/a"], ["http://ex.org/b"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import rdflib
+
+from ontoenv import OntoEnv
+
+PREFIXES = "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+
+
+class ImportDependenciesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.root = Path(self._tmpdir.name)
+        self._write(
+            "a.ttl",
+            "<http://ex.org/a> a owl:Ontology .\n"
+            "# <http://ex.org/a> owl:imports <http://ex.org/commented> .\n"
+            '<http://ex.org/x> <http://ex.org/p> "a" .\n',
+        )
+        self._write(
+            "s.ttl",
+            "@prefix zz: <http://zz.org/ns#> .\n"
+            "<http://ex.org/s> a owl:Ontology .\n"
+            "zz:Sensor a owl:Class .\n",
+        )
+        self._write(
+            "d.ttl",
+            "<http://ex.org/d> a owl:Ontology ; owl:imports <http://ex.org/a> .\n"
+            '<http://ex.org/y> <http://ex.org/p> "d" .\n',
+        )
+
+    def _write(self, name, body):
+        with open(self.root / name, "w", encoding="utf-8") as f:
+            f.write(PREFIXES + body)
+
+    def _model(self):
+        graph = rdflib.Graph()
+        graph.parse(
+            data=PREFIXES
+            + "<http://ex.org/m> a owl:Ontology ; owl:imports <http://ex.org/d> .\n",
+            format="turtle",
+        )
+        return graph
+
+    def test_commented_import_is_not_followed(self):
+        oe = OntoEnv(self.root, initialize=True, strict=True)
+        graph = self._model()
+        oe.import_dependencies(graph)
+        self.assertIn(
+            (rdflib.URIRef("http://ex.org/x"), None, None), graph
+        )
+        self.assertNotIn(
+            rdflib.URIRef("http://ex.org/commented"), set(graph.all_nodes())
+        )
+
+    def test_modified_import_is_reparsed(self):
+        oe = OntoEnv(self.root, initialize=True)
+        oe.import_dependencies(self._model())
+        with open(self.root / "a.ttl", "a", encoding="utf-8") as f:
+            f.write('<http://ex.org/z> <http://ex.org/p> "new" .\n')
+        graph = self._model()
+        oe.import_dependencies(graph)
+        self.assertIn((rdflib.URIRef("http://ex.org/z"), None, None), graph)
+
+    def test_imported_prefixes_are_kept(self):
+        oe = OntoEnv(self.root, initialize=True)
+        graph = rdflib.Graph()
+        graph.parse(
+            data=PREFIXES
+            + "<http://ex.org/m> a owl:Ontology ; owl:imports <http://ex.org/s> .\n",
+            format="turtle",
+        )
+        oe.import_dependencies(graph)
+        self.assertIn("zz:Sensor", graph.serialize(format="turtle"))
+
+
+if __name__ == "__main__":
+    unittest.main()